@@ -2,7 +2,7 @@
 Example: Using caltrans-pems package for automated PeMS data retrieval
 
 Installation: pip install git+https://github.com/Seb-Good/caltrans-pems.git
-Requirements: mechanize, beautifulsoup4, pandas, numpy
+Requirements: mechanize, beautifulsoup4, pandas, numpy, pyarrow
 
 CalTrans District Reference for Bay Area Analysis:
 | District | Region                      | Relevance to Project                              |
@@ -22,7 +22,13 @@ Key Corridors for Commuter Analysis:
 
 import os
 import glob
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 
 # =============================================================================
 # 1. Initialize handler with PeMS credentials
@@ -31,10 +37,14 @@ import pandas as pd
 
 from pems.handler import PeMSHandler
 
+PEMS_USERNAME = 'your_pems_username'
+PEMS_PASSWORD = 'your_pems_password'
+PEMS_DEBUG = True  # Enable logging for troubleshooting
+
 handler = PeMSHandler(
-    username='your_pems_username',
-    password='your_pems_password',
-    debug=True  # Enable logging for troubleshooting
+    username=PEMS_USERNAME,
+    password=PEMS_PASSWORD,
+    debug=PEMS_DEBUG
 )
 
 # =============================================================================
@@ -89,20 +99,74 @@ handler.download_files(
 #   - 'station_day'   : Daily aggregated station data
 #   - 'station_meta'  : Station metadata (location, lanes, etc.)
 
-# Download daily data for multiple years (more manageable file sizes)
-for year in range(2019, 2026):
-    daily_files = handler.get_files(
+def convert_to_parquet(year):
+    """Convert a year's downloaded daily text files to Parquet (one-time).
+
+    Parquet files are written next to the originals and skipped on later
+    runs unless the text file is newer, so the tab-delimited text only has
+    to be parsed once.
+    """
+    convert_options = pa_csv.ConvertOptions(
+        column_types={
+            'Timestamp': pa.timestamp('s'),
+            'Station': pa.int32(),
+            'Flow': pa.float32(),
+        },
+        timestamp_parsers=['%m/%d/%Y %H:%M:%S'],
+        include_columns=['Timestamp', 'Station', 'Flow'],
+    )
+
+    for f in glob.glob(f'./pems_raw_data/daily/{year}/*.txt'):
+        out = os.path.splitext(f)[0] + '.parquet'
+        if os.path.exists(out) and os.path.getmtime(out) >= os.path.getmtime(f):
+            continue
+
+        table = pa_csv.read_csv(
+            f,
+            parse_options=pa_csv.ParseOptions(delimiter='\t'),
+            convert_options=convert_options,
+        )
+        # Write to a temporary file first so an interrupted write never
+        # leaves a truncated .parquet that later runs would trust
+        tmp = out + '.tmp'
+        pq.write_table(table, tmp, compression='zstd', use_dictionary=['Station'])
+        os.replace(tmp, out)
+
+
+# Download daily data for multiple years (more manageable file sizes).
+# Years are independent and network-bound, so they are fetched in parallel.
+# Each worker thread logs in with its own handler since a PeMS session
+# (a single mechanize browser) is not safe to share between threads.
+_thread_state = threading.local()
+
+
+def download_year(year):
+    """Download and convert one year of daily station data."""
+    if not hasattr(_thread_state, 'handler'):
+        _thread_state.handler = PeMSHandler(
+            username=PEMS_USERNAME,
+            password=PEMS_PASSWORD,
+            debug=PEMS_DEBUG
+        )
+    year_handler = _thread_state.handler
+
+    daily_files = year_handler.get_files(
         file_type='station_day',
         district_id='4',  # Bay Area
         years=[year]
     )
-    handler.download_files(
+    year_handler.download_files(
         files=daily_files,
         output_path=f'./pems_raw_data/daily/{year}'
     )
+    convert_to_parquet(year)
     print(f"Downloaded {year} daily data")
 
 
+with ThreadPoolExecutor(max_workers=6) as executor:
+    list(executor.map(download_year, range(2019, 2026)))
+
+
 # =============================================================================
 # 6. Processing downloaded data for corridor-specific analysis
 # =============================================================================
@@ -112,7 +176,13 @@ def load_and_filter_corridor_data():
 
     # Load station metadata to identify corridor stations
     # Station metadata includes location (lat/lon), freeway, direction, etc.
-    station_meta = pd.read_csv('./pems_raw_data/d04_text_meta_yyyy_mm_dd.txt', sep='\t')
+    station_meta = pd.read_csv(
+        './pems_raw_data/d04_text_meta_yyyy_mm_dd.txt',
+        sep='\t',
+        usecols=['ID', 'Fwy', 'Dir'],
+        dtype={'ID': 'int32', 'Fwy': 'int16', 'Dir': 'category'},
+        engine='c'
+    )
 
     # Filter to specific freeways of interest
     # These corridors connect outer suburbs to Bay Area job centers
@@ -135,15 +205,20 @@ def load_and_filter_corridor_data():
 
 def load_corridor_data(year, corridor_station_ids):
     """Load daily data and filter to specific station IDs."""
-    files = glob.glob(f'./pems_raw_data/daily/{year}/*.txt')
+    files = glob.glob(f'./pems_raw_data/daily/{year}/*.parquet')
+
+    # Deduplicated int32 IDs match the Station column type, so the filter's
+    # lookup set is built once without casting each batch
+    station_ids = pa.array(np.unique(np.asarray(corridor_station_ids, dtype=np.int32)))
 
-    dfs = []
-    for f in files:
-        df = pd.read_csv(f, sep='\t')
-        df = df[df['Station'].isin(corridor_station_ids)]
-        dfs.append(df)
+    # Read the Parquet copies written by convert_to_parquet(); only the needed
+    # columns are decoded and row groups without matching stations are skipped
+    dataset = pq.ParquetDataset(files, filters=[('Station', 'in', station_ids)])
+    table = dataset.read(columns=['Timestamp', 'Station', 'Flow'])
 
-    return pd.concat(dfs, ignore_index=True)
+    # Free each Arrow column as it is converted so the table and the frame
+    # are not both held in memory at full size
+    return table.to_pandas(split_blocks=True, self_destruct=True)
 
 
 def calculate_peak_hour_volume(hourly_df):
@@ -151,22 +226,36 @@ def calculate_peak_hour_volume(hourly_df):
 
     Use this with hourly data instead of daily.
     """
-    # Filter to weekdays only
-    hourly_df['Date'] = pd.to_datetime(hourly_df['Timestamp']).dt.date
-    hourly_df['Hour'] = pd.to_datetime(hourly_df['Timestamp']).dt.hour
-    hourly_df['DayOfWeek'] = pd.to_datetime(hourly_df['Timestamp']).dt.dayofweek
-
-    # Weekdays (Mon=0, Fri=4), morning peak (6-9 AM)
-    peak = hourly_df[
-        (hourly_df['DayOfWeek'] < 5) &
-        (hourly_df['Hour'] >= 6) &
-        (hourly_df['Hour'] < 9)
-    ]
-
-    # Aggregate by month
-    peak['Month'] = pd.to_datetime(peak['Date']).dt.to_period('M')
-    monthly_peak = peak.groupby('Month')['Flow'].sum().reset_index()
-    monthly_peak.columns = ['Month', 'Peak_AM_Volume']
+    # Parse timestamps once and derive every calendar field from the result
+    ts = pd.to_datetime(hourly_df['Timestamp'], format='%m/%d/%Y %H:%M:%S', cache=True)
+    hour = ts.dt.hour.values
+    dow = ts.dt.dayofweek.values
+
+    # Weekdays (Mon=0, Fri=4), morning peak (6-9 AM); combined in place so
+    # only two bool arrays are allocated instead of one per comparison and AND
+    mask = np.less(dow, 5)
+    tmp = np.greater_equal(hour, 6)
+    mask &= tmp
+    np.less(hour, 9, out=tmp)
+    mask &= tmp
+    flow = np.nan_to_num(hourly_df['Flow'].values[mask])  # skip NaN like groupby().sum()
+
+    # Truncating to datetime64[M] is a C-level cast; its int64 view is a
+    # month count since 1970-01, used directly as the aggregation key
+    month = ts.values.astype('datetime64[M]')[mask].view(np.int64)
+    if len(month) == 0:
+        return pd.DataFrame({'Month': pd.PeriodIndex([], freq='M'), 'Peak_AM_Volume': []})
+
+    # Aggregate by month in a single pass over dense month offsets
+    first = month.min()
+    offsets = month - first
+    totals = np.bincount(offsets, weights=flow)
+    present = np.flatnonzero(np.bincount(offsets))
+    labels = (first + present).astype('datetime64[M]').astype('datetime64[ns]')
+    monthly_peak = pd.DataFrame({
+        'Month': pd.DatetimeIndex(labels).to_period('M'),
+        'Peak_AM_Volume': totals[present],
+    })
 
     return monthly_peak
 
@@ -180,6 +269,8 @@ if __name__ == '__main__':
     corridor_stations = load_and_filter_corridor_data()
 
     # Load I-580 data (key Tracy/Central Valley commuter corridor)
+    # Years are read one at a time: ParquetDataset.read() already decodes
+    # on Arrow's own thread pool, so outer threads would only oversubscribe it
     i580_data = {}
     for year in range(2019, 2026):
         i580_data[year] = load_corridor_data(year, corridor_stations['I-580'])
@@ -15,12 +15,17 @@ Output:
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.collections import PolyCollection
 from datetime import datetime
+import calendar
+import functools
+import os
 import numpy as np
 import re
 
 # Configuration
 INPUT_FILE = 'bay_area_rto_timeline_expanded.xlsx'
+INPUT_CACHE = 'bay_area_rto_timeline_expanded.feather'  # regenerated when INPUT_FILE changes
 OUTPUT_FILE = 'rto_timeline_visualization.png'
 
 # Date range for visualization
@@ -42,74 +47,120 @@ MILESTONES = [
     (datetime(2025, 1, 2), 'Amazon\n5-Day'),
 ]
 
-def parse_date(date_str):
+# Patterns used by parse_date
+_PAREN_RE = re.compile(r'\s*\([^)]*\)')
+_MONTH_YEAR_RE = re.compile(r'(\w+)\s+(\d{4})')  # "March 2020"
+_MONTH_DAY_YEAR_RE = re.compile(r'(\w+)\s+(\d{1,2}),?\s+(\d{4})')  # "January 2, 2025"
+_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+_MONTHS = {name.lower(): m for m, name in enumerate(calendar.month_name) if name}
+
+# Keywords marking a permanent remote-first policy
+REMOTE_KEYWORDS = ['remote-first', 'digital-first', 'digital by default',
+                   'team anywhere', 'live and work anywhere', 'went remote-first',
+                   'went digital-first']
+_REMOTE_RE = re.compile('|'.join(map(re.escape, REMOTE_KEYWORDS)))
+
+def parse_date(value):
     """Parse various date formats from the spreadsheet."""
-    if pd.isna(date_str) or date_str in ['Not announced', 'Limited data', 'Limited mandate']:
+    # NaN can't be used as a cache key reliably, so handle it before the lookup
+    if pd.isna(value):
         return None
+    return _parse_date_str(str(value))
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date_str(date_str):
+    """Cached worker for parse_date(); the same cell text repeats across rows."""
+    if date_str in ['Not announced', 'Limited data', 'Limited mandate']:
+        return None
+
+    date_str = date_str.strip()
+
+    # Fast path: bare year like "2021"
+    if len(date_str) == 4 and date_str.isdigit() and date_str.startswith('20'):
+        return datetime(int(date_str), 6, 1)  # Default to June
 
     # Remove parenthetical notes like "(3 days/week)"
-    date_str = re.sub(r'\s*\([^)]*\)', '', str(date_str)).strip()
+    if '(' in date_str:
+        date_str = _PAREN_RE.sub('', date_str).strip()
 
     # Handle "N/A" variants
     if date_str.startswith('N/A'):
         return None
 
-    # Common month-year patterns
-    month_year_patterns = [
-        (r'(\w+)\s+(\d{4})', '%B %Y'),  # "March 2020"
-        (r'(\w+)\s+(\d{1,2}),?\s+(\d{4})', '%B %d %Y'),  # "January 2, 2025"
-    ]
-
-    for pattern, fmt in month_year_patterns:
-        match = re.search(pattern, date_str)
-        if match:
-            try:
-                if fmt == '%B %Y':
-                    return datetime.strptime(f"{match.group(1)} {match.group(2)}", fmt)
-                else:
-                    return datetime.strptime(f"{match.group(1)} {match.group(2)} {match.group(3)}", fmt)
-            except ValueError:
-                pass
+    # Fast path: plain "March 2020"
+    parts = date_str.split()
+    if len(parts) == 2 and len(parts[1]) == 4 and parts[1].isdigit():
+        month = _MONTHS.get(parts[0].lower())
+        if month:
+            return datetime(int(parts[1]), month, 1)
+
+    # Common month-year patterns ("March 2020", "January 2, 2025"); month
+    # names are looked up directly rather than going through strptime
+    match = _MONTH_YEAR_RE.search(date_str)
+    if match and match.group(1).lower() in _MONTHS:
+        return datetime(int(match.group(2)), _MONTHS[match.group(1).lower()], 1)
+
+    match = _MONTH_DAY_YEAR_RE.search(date_str)
+    if match and match.group(1).lower() in _MONTHS:
+        try:
+            return datetime(int(match.group(3)), _MONTHS[match.group(1).lower()], int(match.group(2)))
+        except ValueError:
+            pass
 
     # Handle year-only like "2022 (post-Musk acquisition)" or "2021"
-    year_match = re.search(r'\b(20\d{2})\b', date_str)
+    year_match = _YEAR_RE.search(date_str)
     if year_match:
         return datetime(int(year_match.group(1)), 6, 1)  # Default to June
 
     return None
 
 
-def is_remote_first(row):
-    """Determine if company adopted permanent remote-first policy."""
-    hybrid_str = str(row['Hybrid Transition Date']).lower() if pd.notna(row['Hybrid Transition Date']) else ''
-    notes = str(row['Notes']).lower() if pd.notna(row['Notes']) else ''
+def remote_first_mask(df):
+    """Flag companies that adopted a permanent remote-first policy."""
+    hybrid_str = df['Hybrid Transition Date'].fillna('').astype(str).str.lower()
+    notes = df['Notes'].fillna('').astype(str).str.lower()
+
+    return hybrid_str.str.contains(_REMOTE_RE) | notes.str.contains(_REMOTE_RE)
 
-    remote_keywords = ['remote-first', 'digital-first', 'digital by default',
-                       'team anywhere', 'live and work anywhere', 'went remote-first',
-                       'went digital-first']
 
-    return any(kw in hybrid_str or kw in notes for kw in remote_keywords)
+def company_records(df):
+    """
+    Parse each company row once into the fields the timeline needs.
+    Returns a list of dicts aligned with the rows of `df`.
+    """
+    return [
+        {
+            'wfh': parse_date(wfh) or datetime(2020, 3, 15),
+            'hybrid': parse_date(hybrid),
+            'rto': parse_date(rto),
+            'remote_first': bool(rf),
+            'hybrid_str': str(hybrid).lower() if pd.notna(hybrid) else '',
+        }
+        for wfh, hybrid, rto, rf in zip(df['WFH Start Date'], df['Hybrid Transition Date'],
+                                        df['5-Day RTO Date'], remote_first_mask(df))
+    ]
 
 
-def get_company_timeline(row):
+def get_company_timeline(record):
     """
-    Build timeline segments for a company.
+    Build timeline segments for a company from its company_records() entry.
     Returns list of (start_date, end_date, policy_type) tuples.
     """
     segments = []
 
-    wfh_start = parse_date(row['WFH Start Date']) or datetime(2020, 3, 15)
-    hybrid_date = parse_date(row['Hybrid Transition Date'])
-    rto_date = parse_date(row['5-Day RTO Date'])
+    wfh_start = record['wfh']
+    hybrid_date = record['hybrid']
+    rto_date = record['rto']
 
     # Check if company is remote-first (permanent WFH)
-    if is_remote_first(row):
+    if record['remote_first']:
         segments.append((wfh_start, END_DATE, 'remote_first'))
         return segments
 
     # Check if company skipped hybrid (went directly to RTO)
-    hybrid_str = str(row['Hybrid Transition Date']).lower() if pd.notna(row['Hybrid Transition Date']) else ''
-    skipped_hybrid = 'skipped' in hybrid_str or 'n/a' in hybrid_str.lower()
+    hybrid_str = record['hybrid_str']
+    skipped_hybrid = 'skipped' in hybrid_str or 'n/a' in hybrid_str
 
     if skipped_hybrid and rto_date:
         # WFH until RTO
@@ -137,18 +188,20 @@ def create_visualization(df):
     # Filter to companies with good data (exclude Limited data rows)
     df_filtered = df[~df['Hybrid Transition Date'].astype(str).str.contains('Limited data', na=False)].copy()
 
-    # Sort companies by RTO date (companies with 5-day RTO first, then by date)
-    def sort_key(row):
-        rto_date = parse_date(row['5-Day RTO Date'])
-        if rto_date:
-            return (0, rto_date)
-        hybrid_date = parse_date(row['Hybrid Transition Date'])
-        if hybrid_date:
-            return (1, hybrid_date)
-        return (2, datetime(2099, 1, 1))
+    records = company_records(df_filtered)
 
-    df_filtered['sort_key'] = df_filtered.apply(sort_key, axis=1)
-    df_filtered = df_filtered.sort_values('sort_key', ascending=False)
+    # Sort companies by RTO date (companies with 5-day RTO first, then by date)
+    rto_dates = pd.Series([r['rto'] for r in records], dtype=object)
+    hybrid_dates = pd.Series([r['hybrid'] for r in records], dtype=object)
+    # Numeric int8/datetime64 keys sort on contiguous arrays, unlike tuples
+    sort_bucket = np.where(rto_dates.notna(), 0, np.where(hybrid_dates.notna(), 1, 2)).astype(np.int8)
+    sort_date = pd.to_datetime([r['rto'] or r['hybrid'] or datetime(2099, 1, 1) for r in records])
+
+    order = (pd.DataFrame({'sort_bucket': sort_bucket, 'sort_date': sort_date})
+             .sort_values(['sort_bucket', 'sort_date'], ascending=False, kind='stable')
+             .index)
+    df_filtered = df_filtered.iloc[order]
+    records = [records[i] for i in order]
 
     # Create figure
     fig, ax = plt.subplots(figsize=(14, 10))
@@ -156,14 +209,22 @@ def create_visualization(df):
     companies = df_filtered['Employer'].tolist()
     y_positions = range(len(companies))
 
-    # Plot timeline bars for each company
-    for idx, (_, row) in enumerate(df_filtered.iterrows()):
-        segments = get_company_timeline(row)
+    # Plot timeline bars for each company, collecting rectangles per policy
+    # so each policy is drawn as a single collection artist
+    bars_by_policy = {policy: [] for policy in COLORS}
+    for idx, record in enumerate(records):
+        segments = get_company_timeline(record)
         for start, end, policy in segments:
             if start and end:
-                width = (end - start).days
-                ax.barh(idx, width, left=mdates.date2num(start),
-                       color=COLORS[policy], height=0.7, edgecolor='white', linewidth=0.5)
+                left = mdates.date2num(start)
+                right = left + (end - start).days
+                bars_by_policy[policy].append([(left, idx - 0.35), (left, idx + 0.35),
+                                               (right, idx + 0.35), (right, idx - 0.35)])
+
+    for policy, bars in bars_by_policy.items():
+        if bars:
+            ax.add_collection(PolyCollection(bars, facecolors=COLORS[policy],
+                                             edgecolors='white', linewidths=0.5))
 
     # Add milestone lines
     for milestone_date, label in MILESTONES:
@@ -198,11 +259,9 @@ def create_visualization(df):
     ax.legend(handles=legend_elements, loc='lower right', fontsize=9)
 
     # Add summary statistics
-    rto_count = df_filtered['5-Day RTO Date'].apply(
-        lambda x: parse_date(x) is not None and parse_date(x) <= datetime(2026, 1, 20)
-    ).sum()
-    hybrid_count = len(df_filtered) - rto_count - df_filtered.apply(is_remote_first, axis=1).sum()
-    remote_count = df_filtered.apply(is_remote_first, axis=1).sum()
+    rto_count = sum(r['rto'] is not None and r['rto'] <= datetime(2026, 1, 20) for r in records)
+    remote_count = sum(r['remote_first'] for r in records)
+    hybrid_count = len(df_filtered) - rto_count - remote_count
 
     summary = f"As of Jan 2026: {rto_count} companies at 5-day RTO | {hybrid_count} still hybrid | {remote_count} remote-first"
     ax.text(0.5, -0.08, summary, transform=ax.transAxes, ha='center',
@@ -212,17 +271,40 @@ def create_visualization(df):
     ax.grid(axis='x', alpha=0.3)
     ax.set_axisbelow(True)
 
-    plt.tight_layout()
-    plt.savefig(OUTPUT_FILE, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
+    fig.tight_layout()
+
+    # Compute the tight bbox up front (padded as bbox_inches='tight' would) so
+    # savefig doesn't run its own extra layout pass; low PNG compression
+    # trades a slightly larger file for a faster write
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(plt.rcParams['savefig.pad_inches'])
+    fig.savefig(OUTPUT_FILE, dpi=150, bbox_inches=bbox, facecolor='white',
+                pil_kwargs={'optimize': False, 'compress_level': 1})
+    plt.close(fig)
 
     print(f"Visualization saved to {OUTPUT_FILE}")
 
 
+def _load_input():
+    """Read INPUT_FILE, going through a Feather copy on repeat runs."""
+    if (os.path.exists(INPUT_CACHE)
+            and os.path.getmtime(INPUT_CACHE) >= os.path.getmtime(INPUT_FILE)):
+        return pd.read_feather(INPUT_CACHE)
+
+    df = pd.read_excel(INPUT_FILE)
+
+    # Mixed text/date cells can't be stored in Arrow; keep them as text
+    # (parse_date works on str() of the cell anyway)
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].astype('string')
+
+    df.to_feather(INPUT_CACHE)
+    return pd.read_feather(INPUT_CACHE)
+
+
 def main():
     """Main entry point."""
     print(f"Reading data from {INPUT_FILE}...")
-    df = pd.read_excel(INPUT_FILE)
+    df = _load_input()
     print(f"Found {len(df)} companies")
 
     print("Creating visualization...")